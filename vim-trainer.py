@@ -7,6 +7,8 @@ Run: python3 vim_trainer_clean.py
 """
 
 import curses
+import os
+import select
 import time
 from typing import List, Dict
 
@@ -69,176 +71,243 @@ exercises: List[Dict[str, any]] = [
     {'desc': 'spf13 comment (,/)', 'sequence': [',', '/']},
 ]
 
+# Byte-value -> key-name lookup table: one array load per keystroke
+# instead of a branch ladder. Anything not listed maps to '?'.
+_KEYMAP = ['?'] * 256
+_KEYMAP[0x1b] = ESC      # Escape
+_KEYMAP[0x0a] = ENTER    # Newline
+_KEYMAP[0x16] = CTRL_V   # Ctrl+V
+_KEYMAP[0x12] = CTRL_R   # Ctrl+R
+for _c in range(32, 127):  # Printable ASCII
+    _KEYMAP[_c] = chr(_c)
+_KEYMAP = tuple(_KEYMAP)
+
+# Inverse map: key name -> byte code, for interning exercise sequences
+_NAME2CODE = {name: code for code, name in enumerate(_KEYMAP) if name != '?'}
+
 def get_key_name(key: str) -> str:
     """Map curses key to internal name - ONLY addstr-safe chars"""
-    if key == '\x1b':      return ESC
-    if key == '\n':        return ENTER
-    if key == '\x16':      return CTRL_V   # Ctrl+V
-    if key == '\x12':      return CTRL_R   # Ctrl+R
-    if len(key) == 1 and (32 <= ord(key) <= 126):  # Printable ASCII only
-        return key
-    return '?'  # Unknown -> safe fallback
+    return _KEYMAP[ord(key)] if len(key) == 1 and ord(key) < 256 else '?'
+
+# Display glyphs for the special keys (everything else displays as itself)
+_GLYPH = {ESC: '<Esc>', ENTER: '<Ent>', CTRL_V: '<C-v>', CTRL_R: '<C-r>'}
 
 def display_sequence(seq: List[str]) -> str:
     """Safe display string (no unicode issues)"""
-    parts = []
-    for s in seq:
-        if s == ESC:     parts.append('<Esc>')
-        elif s == ENTER: parts.append('<Ent>')
-        elif s == CTRL_V: parts.append('<C-v>')
-        elif s == CTRL_R: parts.append('<C-r>')
-        else:            parts.append(s)
-    return ''.join(parts)
-
-def cleanup_line(stdscr, row: int, col: int = 0):
-    """Clear line from position onward - safe"""
-    stdscr.move(row, col)
-    stdscr.clrtoeol()
-    stdscr.refresh()
+    return ''.join(_GLYPH.get(s, s) for s in seq)
 
-def main(stdscr):
-    # Setup
+# Precompute each exercise's display string, header line and interned
+# key codes once - they're used every run but never change.
+for _i, ex in enumerate(exercises, 1):
+    ex['display'] = display_sequence(ex['sequence'])
+    ex['header'] = f"[{_i:2d}/{len(exercises)}] {ex['desc']:<35}"
+    ex['seq_codes'] = tuple(_NAME2CODE[s] for s in ex['sequence'])
+    # DFA over the key codes: state s accepts exactly seq_codes[s] and
+    # moves to s+1; len(seq_codes) is the accept state. Linear today, but
+    # the transition dicts allow branching sequences later.
+    ex['dfa'] = tuple({c: s + 1} for s, c in enumerate(ex['seq_codes']))
+
+_BANNER = "═" * 60
+
+# Keystrokes read but not yet consumed - fast typing, paste or SSH
+# coalescing can deliver several keys in one os.read()
+_pending = bytearray()
+
+def _read_code() -> int:
+    """Read one keystroke straight off the TTY, bypassing ncurses' input
+    state machine (curses stays output-only). Returns the byte code, or
+    -1 for multi-byte escape sequences (arrows, F-keys) we ignore."""
+    while not _pending:
+        select.select([0], [], [], None)  # Block until input; Ctrl-C still works
+        data = os.read(0, 8)
+        if not data:
+            return -1  # EOF
+        if len(data) > 1 and data[0] == 0x1b:
+            return -1  # Escape sequence, not coalesced keystrokes
+        _pending.extend(data)
+    code = _pending.pop(0)
+    return 0x0a if code == 0x0d else code  # Normalize CR to ENTER
+
+def cleanup_line(win, row: int, col: int = 0):
+    """Clear line from position onward - safe (caller handles the refresh;
+    pads need the windowed noutrefresh form anyway)"""
+    win.move(row, col)  # clrtoeol has no positional form, so the move stays
+    win.clrtoeol()
+
+_initialized = False
+
+def _setup(stdscr):
+    """One-time curses init - repeat sessions skip the color setup."""
+    global _initialized
     curses.curs_set(0)
+    # Buffered draws: nothing hits the terminal until doupdate(), letting
+    # ncurses merge a whole exercise's writes into as few syscalls as it can.
+    stdscr.immedok(False)
+    if _initialized:
+        return
     curses.start_color()
-    curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)  # ✓ Correct
-    curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)    # ✗ Wrong  
-    curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK) # Header
-    
+    curses.use_default_colors()  # -1 below = keep the terminal's background
+    curses.init_pair(1, curses.COLOR_GREEN, -1)   # ✓ Correct
+    curses.init_pair(2, curses.COLOR_RED, -1)     # ✗ Wrong
+    curses.init_pair(3, curses.COLOR_YELLOW, -1)  # Header
+    _initialized = True
+
+def main(stdscr):
+    _setup(stdscr)
+
+    # Resolve the pair attrs once instead of per draw call
+    CP_GREEN = curses.color_pair(1)
+    CP_RED = curses.color_pair(2)
+    CP_YELLOW = curses.color_pair(3)
+    CP_NONE = 0
+
     max_y, max_x = stdscr.getmaxyx()
     current_line = 0
-    
-    def safe_print(text: str, row: int, col: int = 0, color: int = 0, truncate: bool = True):
-        nonlocal current_line
+    max_row = 0  # Highest row actually written - drives the visible slice
+
+    # Header stays on stdscr; everything below lives in one big pad that
+    # holds the whole session. Drawing writes into the pad; refresh_body
+    # paints just the visible slice, so the terminal only ever sees the
+    # scrolled delta - never a clear().
+    body_top = 3
+    pad = curses.newpad(max(1000, 10 * len(exercises)), max_x)
+    pad.scrollok(True)
+
+    def refresh_body():
+        # Pad coordinates: keep the highest written pad row on the bottom
+        # visible line (the view spans max_y - body_top screen rows).
+        view_top = max(0, (max_row - body_top) - (max_y - body_top - 1))
+        pad.noutrefresh(view_top, 0, body_top, 0, max_y - 1, max_x - 1)
+
+    def safe_print(text: str, row: int, col: int = 0, attr: int = 0, truncate: bool = True):
+        nonlocal max_row
         if truncate and len(text) > max_x - col - 1:
             text = text[:max_x - col - 5] + "..."
-        if row >= max_y - 3:  # Prevent overflow
-            stdscr.clear()
-            row = 0
-            nonlocal current_line
-            current_line = 0
-            safe_print("=== NEW PAGE, KEEP GOING! ===", row, 0, 3)
-            row += 1
-        
+
         try:
-            stdscr.move(row, col)
-            if color:
-                stdscr.attron(curses.color_pair(color))
-            stdscr.addstr(row, col, text)
-            if color:
-                stdscr.attroff(curses.color_pair(color))
-            stdscr.refresh()
+            if row < body_top:
+                stdscr.addstr(row, col, text, attr)
+                stdscr.noutrefresh()
+            else:
+                if row > max_row:
+                    max_row = row
+                pad.addstr(row - body_top, col, text, attr)
+                refresh_body()
         except curses.error:
             pass  # Silent fail on edge cases
     
     # Header (stays at top)
-    safe_print("=== VIM KEYSTROKE TRAINER (spf13-vim) ===", 0, 0, 3)
-    safe_print("Press exact sequence. Wrong key = skip. All history preserved.", 1, 0, 3)
+    safe_print("=== VIM KEYSTROKE TRAINER (spf13-vim) ===", 0, 0, CP_YELLOW)
+    safe_print("Press exact sequence. Wrong key = skip. All history preserved.", 1, 0, CP_YELLOW)
     safe_print("", 2, 0)
     current_line = 3
+    curses.doupdate()
 
     # Stats
     total = len(exercises)
-    correct = 0
-    total_time = 0.0
-    errors = 0
+    # Per-exercise results, structure-of-arrays style: one flat array per
+    # field, aggregated in a single pass at the end instead of bumping
+    # scalar counters inside the exercise loop.
+    result_ok = [False] * total
+    result_ns = [0] * total
 
     for i, ex in enumerate(exercises, 1):
+        # Hoist the per-exercise fields to locals - the inner loop
+        # touches only local variables plus _read_code()
+        header = ex['header']
+        disp = ex['display']
+        dfa = ex['dfa']
+        accept = len(dfa)
+
         # Exercise header
-        safe_print(f"[{i:2d}/{total}] {ex['desc']:<35}", current_line, 0)
-        safe_print(f"    Expect: {display_sequence(ex['sequence'])}", current_line + 1, 0)
+        safe_print(header, current_line, 0)
+        safe_print(f"    Expect: {disp}", current_line + 1, 0)
+        safe_print("    Typed:  ", current_line + 2, 0)  # Label drawn once
         input_row = current_line + 2
         result_row = current_line + 3
         current_line = result_row + 1
-        
+        curses.doupdate()
+
         # Input tracking
-        seq = ex['sequence']
-        typed = []
-        start_time = time.time()
-        pos = 0
+        typed_disp = ''
+        start_ns = time.perf_counter_ns()
+        state = 0
         success = True
-        
+
         # Typing loop
-        while pos < len(seq):
-            try:
-                key = stdscr.getkey()
-            except curses.error:
+        while state < accept:
+            code = _read_code()
+            if code < 0:  # Function/arrow keys etc.
                 continue
-                
-            mapped = get_key_name(key)
-            
-            # Clean input line
-            cleanup_line(stdscr, input_row)
-            
-            # Show typed + current
-            typed_disp = ''.join([t if len(t)==1 else f'<{t}>' for t in typed])
-            curr_disp = mapped if len(mapped)==1 else f'<{mapped}>'
-            full_disp = typed_disp + curr_disp
-            
-            safe_print(f"    Typed:  {full_disp}", input_row, 0)
-            
+
+            mapped = _KEYMAP[code]
+
+            # Echo only the new glyph - everything before it is unchanged
+            curr_disp = _GLYPH.get(mapped, mapped)
             col_offset = 13 + len(typed_disp)  # "    Typed:  " = 12 chars
-            if mapped == seq[pos]:
+            nxt = dfa[state].get(code, -1)
+            if nxt >= 0:
                 # GREEN correct key
-                stdscr.move(input_row, col_offset)
-                stdscr.attron(curses.color_pair(1))
-                stdscr.addstr(input_row, col_offset, curr_disp)
-                stdscr.attroff(curses.color_pair(1))
-                typed.append(mapped)
-                pos += 1
+                pad.addstr(input_row - body_top, col_offset, curr_disp, CP_GREEN)
+                typed_disp += curr_disp
+                state = nxt
             else:
                 # RED wrong key
-                stdscr.move(input_row, col_offset)
-                stdscr.attron(curses.color_pair(2))
-                stdscr.addstr(input_row, col_offset, curr_disp)
-                stdscr.attroff(curses.color_pair(2))
+                pad.addstr(input_row - body_top, col_offset, curr_disp, CP_RED)
                 success = False
-                safe_print("    ✗ WRONG - Press any key to skip...", result_row, 0, 2)
-                stdscr.refresh()
-                stdscr.getch()  # Wait
+                safe_print("    ✗ WRONG - Press any key to skip...", result_row, 0, CP_RED)
+                refresh_body()
+                curses.doupdate()
+                _read_code()  # Wait
                 break
-                
-            stdscr.refresh()
+
+            refresh_body()
+            curses.doupdate()
         
         # Result
-        elapsed = time.time() - start_time
-        cleanup_line(stdscr, result_row)
-        
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        result_ok[i - 1] = success
+        result_ns[i - 1] = elapsed_ns
+        cleanup_line(pad, result_row - body_top)
+
         if success:
-            correct += 1
-            total_time += elapsed
-            safe_print(f"    ✓ CORRECT!  {elapsed:5.2f}s", result_row, 0, 1)
+            safe_print(f"    ✓ CORRECT!  {elapsed_ns * 1e-9:5.2f}s", result_row, 0, CP_GREEN)
         else:
-            errors += 1
-            safe_print(f"    ✗ FAILED                    ", result_row, 0, 2)
+            safe_print(f"    ✗ FAILED                    ", result_row, 0, CP_RED)
         
         safe_print("", current_line, 0)  # Spacer
         current_line += 1
-        stdscr.refresh()
+        curses.doupdate()
+
+    # Aggregate the result arrays in one pass
+    correct = sum(result_ok)
+    total_ns = sum(ns for ok, ns in zip(result_ok, result_ns) if ok)
+    errors = total - correct
 
     # Final grade - always at bottom
     final_row = max(10, current_line)
-    safe_print("═" * 60, final_row, 0, 3)
-    safe_print("           TRAINING COMPLETE! FINAL GRADE", final_row + 1, 0, 3)
-    safe_print("═" * 60, final_row + 2, 0, 3)
+    safe_print(_BANNER, final_row, 0, CP_YELLOW)
+    safe_print("           TRAINING COMPLETE! FINAL GRADE", final_row + 1, 0, CP_YELLOW)
+    safe_print(_BANNER, final_row + 2, 0, CP_YELLOW)
     
     accuracy = (correct / total * 100) if total else 0
-    avg_time = total_time / correct if correct else 0
+    avg_time = total_ns * 1e-9 / correct if correct else 0
     
-    safe_print(f"Accuracy:  {accuracy:6.1f}%  ({correct}/{total})", final_row + 3, 0, 3)
-    safe_print(f"Avg time:  {avg_time:7.2f}s per correct exercise", final_row + 4, 0, 3)
-    safe_print(f"Errors:    {errors:3d}", final_row + 5, 0, 3)
+    safe_print(f"Accuracy:  {accuracy:6.1f}%  ({correct}/{total})", final_row + 3, 0, CP_YELLOW)
+    safe_print(f"Avg time:  {avg_time:7.2f}s per correct exercise", final_row + 4, 0, CP_YELLOW)
+    safe_print(f"Errors:    {errors:3d}", final_row + 5, 0, CP_YELLOW)
     
     # Progress tips
     if accuracy > 90:
-        safe_print("🎉 EXPERT LEVEL! You're Vim-ready!", final_row + 7, 0, 1)
+        safe_print("🎉 EXPERT LEVEL! You're Vim-ready!", final_row + 7, 0, CP_GREEN)
     elif accuracy > 70:
-        safe_print("👍 GOOD! Practice daily for mastery.", final_row + 7, 0, 1)
+        safe_print("👍 GOOD! Practice daily for mastery.", final_row + 7, 0, CP_GREEN)
     else:
-        safe_print("📚 Keep practicing! Focus on errors above.", final_row + 7, 0, 3)
+        safe_print("📚 Keep practicing! Focus on errors above.", final_row + 7, 0, CP_YELLOW)
     
-    safe_print("Press any key to exit...", final_row + 9, 0, 3)
-    stdscr.refresh()
-    stdscr.getch()
+    safe_print("Press any key to exit...", final_row + 9, 0, CP_YELLOW)
+    curses.doupdate()
+    _read_code()
 
 if __name__ == "__main__":
     try: